@@ -27,14 +27,18 @@ cdef extern from "joint_histogram.h":
 
 cdef extern from "cubic_spline.h":
     void cubic_spline_transform(ndarray res, ndarray src)
-    double cubic_spline_sample1d(double x, ndarray coef, 
-                                 int mode) 
-    double cubic_spline_sample2d(double x, double y, ndarray coef, 
-                                 int mode_x, int mode_y) 
+    double cubic_spline_sample1d(double x, ndarray coef,
+                                 int mode) nogil
+    double cubic_spline_sample2d(double x, double y, ndarray coef,
+                                 int mode_x, int mode_y) nogil
     double cubic_spline_sample3d(double x, double y, double z, ndarray coef,
-                                 int mode_x, int mode_y, int mode_z) 
-    double cubic_spline_sample4d(double x, double y, double z, double t, ndarray coef, 
-                                 int mode_x, int mode_y, int mode_z, int mode_t)
+                                 int mode_x, int mode_y, int mode_z) nogil
+    double cubic_spline_sample4d(double x, double y, double z, double t, ndarray coef,
+                                 int mode_x, int mode_y, int mode_z, int mode_t) nogil
+    double cubic_spline_sample3d_f32(double x, double y, double z, ndarray coef,
+                                     int mode_x, int mode_y, int mode_z) nogil
+    double cubic_spline_sample4d_f32(double x, double y, double z, double t, ndarray coef,
+                                     int mode_x, int mode_y, int mode_z, int mode_t) nogil
     void cubic_spline_resample3d(ndarray im_resampled, ndarray im, 
                                  double* Tvox, 
                                  int mode_x, int mode_y, int mode_z)
@@ -102,17 +106,19 @@ cdef ndarray _reshaped_double(object in_arr, ndarray sh_arr):
     return np.reshape(in_arr, shape).astype(np.double)
 
 def _cspline_sample1d(ndarray R, ndarray C, X=0, mode='zero'):
-    cdef: 
+    cdef:
         double *r
         double *x
         broadcast multi
-    Xa = _reshaped_double(X, R) 
+        int c_mode = modes[mode]
+    Xa = _reshaped_double(X, R)
     multi = PyArray_MultiIterNew(2, <void*>R, <void*>Xa)
-    while(multi.index < multi.size):
-        r = <double*>PyArray_MultiIter_DATA(multi, 0)
-        x = <double*>PyArray_MultiIter_DATA(multi, 1)
-        r[0] = cubic_spline_sample1d(x[0], C, modes[mode])
-        PyArray_MultiIter_NEXT(multi)
+    with nogil:
+        while(multi.index < multi.size):
+            r = <double*>PyArray_MultiIter_DATA(multi, 0)
+            x = <double*>PyArray_MultiIter_DATA(multi, 1)
+            r[0] = cubic_spline_sample1d(x[0], C, c_mode)
+            PyArray_MultiIter_NEXT(multi)
     return R
 
 def _cspline_sample2d(ndarray R, ndarray C, X=0, Y=0, 
@@ -122,15 +128,18 @@ def _cspline_sample2d(ndarray R, ndarray C, X=0, Y=0,
         double *x
         double *y
         broadcast multi
+        int c_mx = modes[mx]
+        int c_my = modes[my]
     Xa = _reshaped_double(X, R)
     Ya = _reshaped_double(Y, R)
     multi = PyArray_MultiIterNew(3, <void*>R, <void*>Xa, <void*>Ya)
-    while(multi.index < multi.size):
-        r = <double*>PyArray_MultiIter_DATA(multi, 0)
-        x = <double*>PyArray_MultiIter_DATA(multi, 1)
-        y = <double*>PyArray_MultiIter_DATA(multi, 2)
-        r[0] = cubic_spline_sample2d(x[0], y[0], C, modes[mx], modes[my])
-        PyArray_MultiIter_NEXT(multi)
+    with nogil:
+        while(multi.index < multi.size):
+            r = <double*>PyArray_MultiIter_DATA(multi, 0)
+            x = <double*>PyArray_MultiIter_DATA(multi, 1)
+            y = <double*>PyArray_MultiIter_DATA(multi, 2)
+            r[0] = cubic_spline_sample2d(x[0], y[0], C, c_mx, c_my)
+            PyArray_MultiIter_NEXT(multi)
     return R
 
 def _cspline_sample3d(ndarray R, ndarray C, X=0, Y=0, Z=0, 
@@ -141,24 +150,28 @@ def _cspline_sample3d(ndarray R, ndarray C, X=0, Y=0, Z=0,
         double *y
         double *z
         broadcast multi
+        int c_mx = modes[mx]
+        int c_my = modes[my]
+        int c_mz = modes[mz]
     Xa = _reshaped_double(X, R)
     Ya = _reshaped_double(Y, R)
     Za = _reshaped_double(Z, R)
     multi = PyArray_MultiIterNew(4, <void*>R, <void*>Xa, <void*>Ya, <void*>Za)
-    while(multi.index < multi.size):
-        r = <double*>PyArray_MultiIter_DATA(multi, 0)
-        x = <double*>PyArray_MultiIter_DATA(multi, 1)
-        y = <double*>PyArray_MultiIter_DATA(multi, 2)
-        z = <double*>PyArray_MultiIter_DATA(multi, 3)
-        r[0] = cubic_spline_sample3d(x[0], y[0], z[0], C, modes[mx], modes[my], modes[mz])
-        PyArray_MultiIter_NEXT(multi)
+    with nogil:
+        while(multi.index < multi.size):
+            r = <double*>PyArray_MultiIter_DATA(multi, 0)
+            x = <double*>PyArray_MultiIter_DATA(multi, 1)
+            y = <double*>PyArray_MultiIter_DATA(multi, 2)
+            z = <double*>PyArray_MultiIter_DATA(multi, 3)
+            r[0] = cubic_spline_sample3d(x[0], y[0], z[0], C, c_mx, c_my, c_mz)
+            PyArray_MultiIter_NEXT(multi)
     return R
 
 
 def _cspline_sample4d(ndarray R, ndarray C, X=0, Y=0, Z=0, T=0, 
                       mx='zero', my='zero', mz='zero', mt='zero'):
     """
-    In-place cubic spline sampling. R.dtype must be 'double'. 
+    In-place cubic spline sampling. R.dtype must be 'double'.
     """
     cdef:
         double *r
@@ -167,19 +180,88 @@ def _cspline_sample4d(ndarray R, ndarray C, X=0, Y=0, Z=0, T=0,
         double *z
         double *t
         broadcast multi
+        int c_mx = modes[mx]
+        int c_my = modes[my]
+        int c_mz = modes[mz]
+        int c_mt = modes[mt]
+    Xa = _reshaped_double(X, R)
+    Ya = _reshaped_double(Y, R)
+    Za = _reshaped_double(Z, R)
+    Ta = _reshaped_double(T, R)
+    multi = PyArray_MultiIterNew(5, <void*>R, <void*>Xa, <void*>Ya, <void*>Za, <void*>Ta)
+    with nogil:
+        while(multi.index < multi.size):
+            r = <double*>PyArray_MultiIter_DATA(multi, 0)
+            x = <double*>PyArray_MultiIter_DATA(multi, 1)
+            y = <double*>PyArray_MultiIter_DATA(multi, 2)
+            z = <double*>PyArray_MultiIter_DATA(multi, 3)
+            t = <double*>PyArray_MultiIter_DATA(multi, 4)
+            r[0] = cubic_spline_sample4d(x[0], y[0], z[0], t[0], C, c_mx, c_my, c_mz, c_mt)
+            PyArray_MultiIter_NEXT(multi)
+    return R
+
+
+def _cspline_sample3d_f32(ndarray R, ndarray C, X=0, Y=0, Z=0,
+                          mx='zero', my='zero', mz='zero'):
+    """
+    In-place cubic spline sampling in single precision. R.dtype and
+    C.dtype must be 'float32'.
+    """
+    cdef:
+        float *r
+        double *x
+        double *y
+        double *z
+        broadcast multi
+        int c_mx = modes[mx]
+        int c_my = modes[my]
+        int c_mz = modes[mz]
+    Xa = _reshaped_double(X, R)
+    Ya = _reshaped_double(Y, R)
+    Za = _reshaped_double(Z, R)
+    multi = PyArray_MultiIterNew(4, <void*>R, <void*>Xa, <void*>Ya, <void*>Za)
+    with nogil:
+        while(multi.index < multi.size):
+            r = <float*>PyArray_MultiIter_DATA(multi, 0)
+            x = <double*>PyArray_MultiIter_DATA(multi, 1)
+            y = <double*>PyArray_MultiIter_DATA(multi, 2)
+            z = <double*>PyArray_MultiIter_DATA(multi, 3)
+            r[0] = <float>cubic_spline_sample3d_f32(x[0], y[0], z[0], C, c_mx, c_my, c_mz)
+            PyArray_MultiIter_NEXT(multi)
+    return R
+
+
+def _cspline_sample4d_f32(ndarray R, ndarray C, X=0, Y=0, Z=0, T=0,
+                          mx='zero', my='zero', mz='zero', mt='zero'):
+    """
+    In-place cubic spline sampling in single precision. R.dtype and
+    C.dtype must be 'float32'.
+    """
+    cdef:
+        float *r
+        double *x
+        double *y
+        double *z
+        double *t
+        broadcast multi
+        int c_mx = modes[mx]
+        int c_my = modes[my]
+        int c_mz = modes[mz]
+        int c_mt = modes[mt]
     Xa = _reshaped_double(X, R)
     Ya = _reshaped_double(Y, R)
     Za = _reshaped_double(Z, R)
     Ta = _reshaped_double(T, R)
     multi = PyArray_MultiIterNew(5, <void*>R, <void*>Xa, <void*>Ya, <void*>Za, <void*>Ta)
-    while(multi.index < multi.size):
-        r = <double*>PyArray_MultiIter_DATA(multi, 0)
-        x = <double*>PyArray_MultiIter_DATA(multi, 1)
-        y = <double*>PyArray_MultiIter_DATA(multi, 2)
-        z = <double*>PyArray_MultiIter_DATA(multi, 3)
-        t = <double*>PyArray_MultiIter_DATA(multi, 4)
-        r[0] = cubic_spline_sample4d(x[0], y[0], z[0], t[0], C, modes[mx], modes[my], modes[mz], modes[mt])
-        PyArray_MultiIter_NEXT(multi)
+    with nogil:
+        while(multi.index < multi.size):
+            r = <float*>PyArray_MultiIter_DATA(multi, 0)
+            x = <double*>PyArray_MultiIter_DATA(multi, 1)
+            y = <double*>PyArray_MultiIter_DATA(multi, 2)
+            z = <double*>PyArray_MultiIter_DATA(multi, 3)
+            t = <double*>PyArray_MultiIter_DATA(multi, 4)
+            r[0] = <float>cubic_spline_sample4d_f32(x[0], y[0], z[0], t[0], C, c_mx, c_my, c_mz, c_mt)
+            PyArray_MultiIter_NEXT(multi)
     return R
 
 
@@ -548,7 +548,219 @@ double cubic_spline_sample4d (double x, double y, double z, double t, const PyAr
 }
 
 
-/* 
+/*
+  Single precision variants of the above samplers. The coefficient
+  image is expected in float32; spline weights and the accumulated
+  signal value are still computed in double precision.
+*/
+
+double cubic_spline_sample3d_f32 (double x, double y, double z, const PyArrayObject* Coef,
+				  int mode_x, int mode_y, int mode_z)
+{
+  unsigned int ddimX = PyArray_DIM(Coef, 0) - 1;
+  unsigned int ddimY = PyArray_DIM(Coef, 1) - 1;
+  unsigned int ddimZ = PyArray_DIM(Coef, 2) - 1;
+  unsigned int offX = PyArray_STRIDE(Coef, 0)/sizeof(float);
+  unsigned int offY = PyArray_STRIDE(Coef, 1)/sizeof(float);
+  unsigned int offZ = PyArray_STRIDE(Coef, 2)/sizeof(float);
+  float *coef = PyArray_DATA(Coef);
+  float *buf;
+  int nx, ny, nz, px, py, pz;
+  int xx, yy, zz;
+  double s, aux, aux2;
+  double bspx[4], bspy[4], bspz[4];
+  int posx[4], posy[4], posz[4];
+  double *buf_bspx, *buf_bspy, *buf_bspz;
+  int *buf_posx, *buf_posy, *buf_posz;
+  int shftyz, shftz;
+  double wx = 1, wy = 1, wz = 1;
+
+  APPLY_BOUNDARY_CONDITIONS(mode_x, x, wx, ddimX);
+  COMPUTE_NEIGHBORS(x, ddimX, nx, px);
+  APPLY_BOUNDARY_CONDITIONS(mode_y, y, wy, ddimY);
+  COMPUTE_NEIGHBORS(y, ddimY, ny, py);
+  APPLY_BOUNDARY_CONDITIONS(mode_z, z, wz, ddimZ);
+  COMPUTE_NEIGHBORS(z, ddimZ, nz, pz);
+
+  /* Compute the B-spline values as well as the image positions
+     where to find the B-spline coefficients (including mirror conditions) */
+  buf_bspx = (double*)bspx;
+  buf_posx = (int*)posx;
+  for (xx = nx; xx <= px; xx ++, buf_bspx ++, buf_posx ++) {
+    *buf_bspx = cubic_spline_basis(x-(double)xx);
+    *buf_posx = _mirrored_position(xx, ddimX);
+  }
+
+  buf_bspy = (double*)bspy;
+  buf_posy = (int*)posy;
+  for (yy = ny; yy <= py; yy ++, buf_bspy ++, buf_posy ++) {
+    *buf_bspy = cubic_spline_basis(y-(double)yy);
+    *buf_posy = _mirrored_position(yy, ddimY);
+  }
+
+  buf_bspz = (double*)bspz;
+  buf_posz = (int*)posz;
+  for (zz = nz; zz <= pz; zz ++, buf_bspz ++, buf_posz ++) {
+    *buf_bspz = cubic_spline_basis(z-(double)zz);
+    *buf_posz = _mirrored_position(zz, ddimZ);
+  }
+
+  /* Compute the interpolated value incrementally */
+  s = 0.0;
+  buf_bspz = (double*)bspz;
+  buf_posz = (int*)posz;
+
+  for (zz = nz; zz <= pz; zz ++, buf_bspz ++, buf_posz ++) {
+
+    aux2 = 0.0;
+    buf_bspy = (double*)bspy;
+    buf_posy = (int*)posy;
+    shftz = offZ*(*buf_posz);
+
+    for (yy = ny; yy <= py; yy ++, buf_bspy ++, buf_posy ++) {
+
+      aux = 0.0;
+      buf_bspx = (double*)bspx;
+      buf_posx = (int*)posx;
+      shftyz = offY*(*buf_posy) + shftz;
+
+      for (xx = nx; xx <= px; xx ++, buf_bspx ++, buf_posx ++) {
+
+	/* Point towards the coefficient value at position (xx, yy, zz) */
+	buf = coef + offX*(*buf_posx) + shftyz;
+
+	/* Update signal value */
+	aux += (*buf) * (*buf_bspx);
+
+      } /* end loop on x */
+      aux2 += aux * (*buf_bspy);
+
+    }  /* end loop on y */
+    s += aux2 * (*buf_bspz);
+
+  } /* end loop on z */
+
+
+  return wx*wy*wz*s;
+
+}
+
+
+
+double cubic_spline_sample4d_f32 (double x, double y, double z, double t, const PyArrayObject* Coef,
+				  int mode_x, int mode_y, int mode_z, int mode_t)
+{
+  unsigned int ddimX = PyArray_DIM(Coef, 0) - 1;
+  unsigned int ddimY = PyArray_DIM(Coef, 1) - 1;
+  unsigned int ddimZ = PyArray_DIM(Coef, 2) - 1;
+  unsigned int ddimT = PyArray_DIM(Coef, 3) - 1;
+  unsigned int offX = PyArray_STRIDE(Coef, 0)/sizeof(float);
+  unsigned int offY = PyArray_STRIDE(Coef, 1)/sizeof(float);
+  unsigned int offZ = PyArray_STRIDE(Coef, 2)/sizeof(float);
+  unsigned int offT = PyArray_STRIDE(Coef, 3)/sizeof(float);
+  float *coef = PyArray_DATA(Coef);
+  float *buf;
+  int nx, ny, nz, nt, px, py, pz, pt;
+  int xx, yy, zz, tt;
+  double s, aux, aux2, aux3;
+  double bspx[4], bspy[4], bspz[4], bspt[4];
+  int posx[4], posy[4], posz[4], post[4];
+  double *buf_bspx, *buf_bspy, *buf_bspz, *buf_bspt;
+  int *buf_posx, *buf_posy, *buf_posz, *buf_post;
+  int shftyzt, shftzt, shftt;
+  double wx = 1, wy = 1, wz = 1, wt = 1;
+
+  APPLY_BOUNDARY_CONDITIONS(mode_x, x, wx, ddimX);
+  COMPUTE_NEIGHBORS(x, ddimX, nx, px);
+  APPLY_BOUNDARY_CONDITIONS(mode_y, y, wy, ddimY);
+  COMPUTE_NEIGHBORS(y, ddimY, ny, py);
+  APPLY_BOUNDARY_CONDITIONS(mode_z, z, wz, ddimZ);
+  COMPUTE_NEIGHBORS(z, ddimZ, nz, pz);
+  APPLY_BOUNDARY_CONDITIONS(mode_t, t, wt, ddimT);
+  COMPUTE_NEIGHBORS(t, ddimT, nt, pt);
+
+  /* Compute the B-spline values as well as the image positions
+     where to find the B-spline coefficients (including mirror conditions) */
+  buf_bspx = (double*)bspx;
+  buf_posx = (int*)posx;
+  for (xx = nx; xx <= px; xx ++, buf_bspx ++, buf_posx ++) {
+    *buf_bspx = cubic_spline_basis(x-(double)xx);
+    *buf_posx = _mirrored_position(xx, ddimX);
+  }
+
+  buf_bspy = (double*)bspy;
+  buf_posy = (int*)posy;
+  for (yy = ny; yy <= py; yy ++, buf_bspy ++, buf_posy ++) {
+    *buf_bspy = cubic_spline_basis(y-(double)yy);
+    *buf_posy = _mirrored_position(yy, ddimY);
+  }
+
+  buf_bspz = (double*)bspz;
+  buf_posz = (int*)posz;
+  for (zz = nz; zz <= pz; zz ++, buf_bspz ++, buf_posz ++) {
+    *buf_bspz = cubic_spline_basis(z-(double)zz);
+    *buf_posz = _mirrored_position(zz, ddimZ);
+  }
+
+  buf_bspt = (double*)bspt;
+  buf_post = (int*)post;
+  for (tt = nt; tt <= pt; tt ++, buf_bspt ++, buf_post ++) {
+    *buf_bspt = cubic_spline_basis(t-(double)tt);
+    *buf_post = _mirrored_position(tt, ddimT);
+  }
+
+
+  /* Compute the interpolated value incrementally by visiting the neighbors in turn  */
+  s = 0.0;
+  buf_bspt = (double*)bspt;
+  buf_post = (int*)post;
+
+  for (tt = nt; tt <= pt; tt ++, buf_bspt ++, buf_post ++) {
+
+    aux3 = 0.0;
+    buf_bspz = (double*)bspz;
+    buf_posz = (int*)posz;
+    shftt = offT*(*buf_post);
+
+    for (zz = nz; zz <= pz; zz ++, buf_bspz ++, buf_posz ++) {
+
+      aux2 = 0.0;
+      buf_bspy = (double*)bspy;
+      buf_posy = (int*)posy;
+      shftzt =  offZ*(*buf_posz) + shftt;
+
+      for (yy = ny; yy <= py; yy ++, buf_bspy ++, buf_posy ++) {
+
+	aux = 0.0;
+	buf_bspx = (double*)bspx;
+	buf_posx = (int*)posx;
+	shftyzt = offY*(*buf_posy) + shftzt;
+
+	for (xx = nx; xx <= px; xx ++, buf_bspx ++, buf_posx ++) {
+
+	  /* Point towards the coefficient value at position (xx, yy, zz, tt) */
+	  buf = coef + offX*(*buf_posx) + shftyzt;
+
+	  /* Update signal value */
+	  aux += (*buf) * (*buf_bspx);
+
+	} /* end loop on x */
+	aux2 += aux * (*buf_bspy);
+
+      }  /* end loop on y */
+      aux3 += aux2 * (*buf_bspz);
+
+    } /* end loop on z */
+    s += aux3 * (*buf_bspt);
+
+  } /* end loop on t */
+
+  return wx*wy*wz*wt*s;
+
+}
+
+
+/*
    Resample a 3d image submitted to an affine transformation.
    Tvox is the voxel transformation from the image to the destination grid.  
 */
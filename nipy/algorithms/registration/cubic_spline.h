@@ -53,7 +53,14 @@ extern "C" {
   extern double cubic_spline_sample3d(double x, double y, double z, const PyArrayObject* coef, 
 				      int mode_x, int mode_y, int mode_z);
   extern double cubic_spline_sample4d(double x, double y, double z, double t, const PyArrayObject* coef,
-				      int mode_x, int mode_y, int mode_z, int mode_t); 
+				      int mode_x, int mode_y, int mode_z, int mode_t);
+  /*!
+    \brief Single precision sampler variants (float32 coefficient image)
+  */
+  extern double cubic_spline_sample3d_f32(double x, double y, double z, const PyArrayObject* coef,
+					  int mode_x, int mode_y, int mode_z);
+  extern double cubic_spline_sample4d_f32(double x, double y, double z, double t, const PyArrayObject* coef,
+					  int mode_x, int mode_y, int mode_z, int mode_t);
   extern void cubic_spline_resample3d(PyArrayObject* im_resampled, const PyArrayObject* im, 
 				      const double* Tvox, 
 				      int mode_x, int mode_y, int mode_z);
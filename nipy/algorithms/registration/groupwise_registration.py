@@ -14,14 +14,20 @@ Transactions on*;  30:1546--1554
 from __future__ import absolute_import
 from __future__ import print_function
 
+import multiprocessing
 import os
 import warnings
 
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:  # Python 2 without the `futures` backport
+    ThreadPoolExecutor = None
+
 import numpy as np
 
 from ...externals.six import string_types
 
-from nibabel.affines import apply_affine
+from nibabel.optpkg import optional_package
 
 from ...fixes.nibabel import io_orientation
 from ...io.nibcompat import get_header
@@ -34,10 +40,19 @@ from .optimizer import configure_optimizer, use_derivatives
 from .type_check import (check_type, check_type_and_shape)
 from ._registration import (_cspline_transform,
                             _cspline_sample3d,
-                            _cspline_sample4d)
+                            _cspline_sample4d,
+                            _cspline_sample3d_f32,
+                            _cspline_sample4d_f32)
 
 
 VERBOSE = os.environ.get('NIPY_DEBUG_PRINT', False)
+# Opt-in GPU resampling; requires cupy
+USE_CUDA = os.environ.get('NIPY_REALIGN_CUDA', False)
+if USE_CUDA:
+    cupy, HAVE_CUPY, _ = optional_package('cupy')
+else:
+    cupy, HAVE_CUPY = None, False
+numba, HAVE_NUMBA, _ = optional_package('numba')
 INTERLEAVED = None
 XTOL = 1e-5
 FTOL = 1e-5
@@ -46,6 +61,78 @@ STEPSIZE = 1e-6
 SMALL = 1e-20
 MAXITER = 64
 MAXFUN = None
+TILE_SIZE = 2 ** 13
+
+
+def cspline_sample_tiled(R, C, X, Y, Z, T=None, **kwargs):
+    """
+    Cubic spline sampling performed tile by tile along the point list.
+
+    The scattered lookups into the coefficient array `C` far exceed
+    cache for typical fMRI volumes. Processing `TILE_SIZE` points at a
+    time keeps each tile's coordinates, output and the coefficient
+    neighborhood it touches cache-resident.
+
+    `R`, `X`, `Y`, `Z` (and `T` for 4d sampling) are one-dimensional
+    arrays of equal length. Sampling is 3d if `T` is None, 4d
+    otherwise. If `R` is float32, the single precision C kernels are
+    used and `C` must be float32 as well; any other dtype goes through
+    the double precision kernels.
+    """
+    if R.dtype == np.float32:
+        sample3d, sample4d = _cspline_sample3d_f32, _cspline_sample4d_f32
+    else:
+        sample3d, sample4d = _cspline_sample3d, _cspline_sample4d
+    for s in range(0, len(X), TILE_SIZE):
+        tile = slice(s, s + TILE_SIZE)
+        if T is None:
+            sample3d(R[tile], C,
+                     X[tile], Y[tile], Z[tile], **kwargs)
+        else:
+            sample4d(R[tile], C,
+                     X[tile], Y[tile], Z[tile], T[tile], **kwargs)
+    return R
+
+
+if HAVE_NUMBA:
+    @numba.njit(fastmath=True, parallel=True, cache=True)
+    def _sum_sq(x):
+        s = 0.
+        for i in numba.prange(x.size):
+            s += x[i] * x[i]
+        return s
+else:
+    def _sum_sq(x):
+        return np.dot(x, x)
+
+
+def mean_sq(x):
+    """
+    Mean of squares of a one-dimensional array.
+
+    Computed as a single-pass reduction without materializing the
+    ``x ** 2`` temporary that ``np.mean(x ** 2)`` would allocate: a
+    multi-threaded compiled loop when numba is installed, a BLAS dot
+    product otherwise.
+    """
+    return _sum_sq(x) / x.size
+
+
+def map_parallel(func, args):
+    """
+    Apply `func` to each element of `args`, using a thread pool if
+    available and the sequence has more than one element.
+
+    This is only worthwhile if `func` spends most of its time in
+    C routines operating on disjoint outputs, as is the case for
+    per-scan resampling.
+    """
+    args = list(args)
+    if ThreadPoolExecutor is None or len(args) < 2:
+        return [func(a) for a in args]
+    nworkers = min(len(args), multiprocessing.cpu_count())
+    with ThreadPoolExecutor(max_workers=nworkers) as executor:
+        return list(executor.map(func, args))
 
 
 def interp_slice_times(Z, slice_times, tr):
@@ -63,17 +150,53 @@ def interp_slice_times(Z, slice_times, tr):
 
 def scanner_coords(xyz, affine, from_world, to_world):
     Tv = np.dot(from_world, np.dot(affine, to_world))
-    XYZ = apply_affine(Tv, xyz)
+    return grid_coords(xyz, Tv)
+
+
+def grid_coords(xyz, Tv):
+    # Apply the affine as an explicit 3x3 product plus translation:
+    # same result as nibabel's apply_affine without padding the points
+    # to homogeneous 4-vectors, and the translation is added in place.
+    XYZ = np.dot(xyz, Tv[0:3, 0:3].T)
+    XYZ += Tv[0:3, 3]
     return XYZ[:, 0], XYZ[:, 1], XYZ[:, 2]
 
 
+def scanner_transforms(transforms, from_world, to_world):
+    """
+    Compute the grid-to-grid transform for every scan in one batched
+    matrix product.
+
+    Returns an (nscans, 4, 4) array `Tv` such that ``Tv[t]`` equals
+    ``from_world * transforms[t] * to_world``.
+    """
+    affines = np.array([t.as_affine() for t in transforms])
+    return np.einsum('ij,tjk,kl->til', from_world, affines, to_world)
+
+
 def make_grid(dims, subsampling=(1, 1, 1), borders=(0, 0, 0)):
     slices = [slice(b, d - b, s)\
                   for d, s, b in zip(dims, subsampling, borders)]
     xyz = np.mgrid[slices]
     xyz = np.rollaxis(xyz, 0, 4)
     xyz = np.reshape(xyz, [np.prod(xyz.shape[0:-1]), 3])
-    return xyz
+    # Convert the integer grid to C-contiguous doubles once at build
+    # time: every affine application would otherwise up-cast the whole
+    # point list again on each call (the C sampling kernels take
+    # double coordinates in both precision variants).
+    return xyz.astype('double')
+
+
+def interleaved_slice_order(nslices):
+    """
+    Slice order of an interleaved acquisition collecting even slices
+    first: the inverse permutation of [0, 2, 4, ..., 1, 3, 5, ...],
+    in closed form. Even slices are acquired first, odd slices
+    starting at position ceil(nslices / 2).
+    """
+    aux = np.arange(nslices) // 2
+    aux[1::2] += (nslices + 1) // 2
+    return aux
 
 
 def guess_slice_axis_and_direction(slice_info, affine):
@@ -141,6 +264,10 @@ class Image4d(object):
         # unformatted parameters
         self._slice_times = slice_times
 
+        # cached cubic spline coefficients, see `get_cbspline`
+        self._cbspline = None
+        self._cbspline_time_interp = None
+
         if isinstance(data, np.ndarray):
             self._data = data
             self._shape = data.shape
@@ -186,6 +313,15 @@ class Image4d(object):
         # Check that slice times are smaller than repetition time
         if np.max(self.slice_times) > self.tr:
             raise ValueError("slice times should be smaller than repetition time")
+        # Pre-compute the constants needed by `scanner_time`: the
+        # cyclically extended slice time table used for interpolation
+        # and the reciprocal of the repetition time. Both are fixed for
+        # a given acquisition, while `scanner_time` is called once per
+        # scan and per resampling step.
+        self._slice_times_aux = np.concatenate(
+            (self.slice_times, [self.slice_times[0] + self.tr]))
+        self._inv_tr = 1. / self.tr
+        self._slice_times_aux_scaled = self._slice_times_aux * self._inv_tr
 
     def z_to_slice(self, z):
         """
@@ -202,11 +338,61 @@ class Image4d(object):
         """
         tv = scanner_time(zv, t)
         zv, tv are grid coordinates; t is an actual time value.
+
+        Same computation as `interp_slice_times`, except that the
+        extended slice time table and 1/tr are looked up rather than
+        rebuilt on each call.
+        """
+        return t * self._inv_tr - self.scanner_time_correction(zv)
+
+    def scanner_time_correction(self, zv):
         """
-        corr = interp_slice_times(self.z_to_slice(zv),
-                                  self.slice_times,
-                                  self.tr)
-        return (t - corr) / self.tr
+        Slice timing correction term of `scanner_time`, in units of
+        repetition time, such that::
+
+            scanner_time(zv, t) == t / tr - scanner_time_correction(zv)
+
+        Splitting off this term lets callers hoist the scan-dependent
+        part, which is a precomputable scalar per scan.
+        """
+        Z = np.asarray(self.z_to_slice(zv))
+        aux = self._slice_times_aux_scaled
+        Zf = np.floor(Z).astype('int')
+        w = Z - Zf
+        Zal = Zf % self.nslices
+        return (1 - w) * aux[Zal] + w * aux[Zal + 1]\
+            + (Z - Zal - w) * self._inv_tr
+
+    def get_cbspline(self, time_interp, dtype='double'):
+        """
+        Return the cubic spline coefficients of the data: the 4d
+        transform if `time_interp`, otherwise per-volume 3d
+        transforms stacked along the last axis.
+
+        The coefficients only depend on the data, so they are computed
+        once and cached; multiscale realignment, which rebuilds a
+        Realign4dAlgorithm per subsampling level, would otherwise
+        recompute them at each level. The cache holds one copy of the
+        series in the requested `dtype` and survives `free_data`. The
+        spline transform itself always runs in double precision; a
+        float32 request downcasts the result for use with the single
+        precision sampling kernels.
+        """
+        dtype = np.dtype(dtype)
+        if self._cbspline is None or \
+                self._cbspline_time_interp != time_interp or \
+                self._cbspline.dtype != dtype:
+            data = self.get_data()
+            if time_interp:
+                cbspline = _cspline_transform(data)
+            else:
+                cbspline = np.zeros(self.get_shape(), dtype='double')
+                for t in range(self.get_shape()[3]):
+                    cbspline[:, :, :, t] =\
+                        _cspline_transform(data[:, :, :, t])
+            self._cbspline = cbspline.astype(dtype, copy=False)
+            self._cbspline_time_interp = time_interp
+        return self._cbspline
 
     def free_data(self):
         if self._get_data is not None:
@@ -231,7 +417,8 @@ class Realign4dAlgorithm(object):
                  gtol=GTOL,
                  stepsize=STEPSIZE,
                  maxiter=MAXITER,
-                 maxfun=MAXFUN):
+                 maxfun=MAXFUN,
+                 dtype='double'):
 
         # Check arguments
         check_type_and_shape(subsampling, int, 3)
@@ -243,16 +430,28 @@ class Realign4dAlgorithm(object):
         check_type(stepsize, float)
         check_type(maxiter, int)
         check_type(maxfun, int, accept_none=True)
+        dtype = np.dtype(dtype)
+        if dtype not in (np.dtype('double'), np.dtype('float32')):
+            raise ValueError('dtype should be float64 or float32, got %s'
+                             % dtype)
 
         # Get dimensional parameters
         self.dims = im4d.get_shape()
         self.nscans = self.dims[3]
         # Reduce borders if spatial image dimension too small to avoid
         # getting an empty volume of interest
-        borders = [min(b, d/2 - (not d%2)) for (b, d) in zip(borders, self.dims[0:3])]
+        # Use floor division so borders stay ints: on Python 3, d / 2
+        # would produce float bounds for the grid slices
+        borders = [min(b, d // 2 - (not d % 2))
+                   for (b, d) in zip(borders, self.dims[0:3])]
         self.xyz = make_grid(self.dims[0:3], subsampling, borders)
         masksize = self.xyz.shape[0]
-        self.data = np.zeros([masksize, self.nscans], dtype='double')
+        # Scans-first layout: each self.data[t] row is a contiguous
+        # view of one resampled scan. `dtype` controls the storage
+        # precision of the resampled data and spline coefficients;
+        # float32 halves the memory footprint of both at the cost of
+        # rounding the resampled intensities.
+        self.data = np.zeros([self.nscans, masksize], dtype=dtype)
 
         # Initialize space/time transformation parameters
         self.affine = im4d.affine
@@ -262,17 +461,18 @@ class Realign4dAlgorithm(object):
         else:
             self.transforms = transforms
 
-        # Compute the 4d cubic spline transform
+        # Compute the 4d cubic spline transform. The coefficients
+        # match the data storage precision; the estimation statistics
+        # below always accumulate in double precision regardless.
         self.time_interp = time_interp
         if time_interp:
             self.timestamps = im4d.tr * np.arange(self.nscans)
             self.scanner_time = im4d.scanner_time
-            self.cbspline = _cspline_transform(im4d.get_data())
-        else:
-            self.cbspline = np.zeros(self.dims, dtype='double')
-            for t in range(self.dims[3]):
-                self.cbspline[:, :, :, t] =\
-                    _cspline_transform(im4d.get_data()[:, :, :, t])
+            # scan timestamps in repetition time units, hoisting the
+            # scan-dependent term out of the scanner time computation
+            self.scaled_timestamps = self.timestamps * im4d._inv_tr
+            self.scanner_time_correction = im4d.scanner_time_correction
+        self.cbspline = im4d.get_cbspline(time_interp, dtype=dtype)
 
         # The reference scan conventionally defines the head
         # coordinate system
@@ -294,9 +494,14 @@ class Realign4dAlgorithm(object):
         self._res = np.zeros(masksize, dtype='double')
         self._res0 = np.zeros(masksize, dtype='double')
         self._aux = np.zeros(masksize, dtype='double')
+        self._sum = np.zeros(masksize, dtype='double')
+        self._sumsq = np.zeros(masksize, dtype='double')
         self.A = np.zeros((masksize, self.transforms[0].param.size),
                           dtype='double')
         self._pc = None
+        # Per-scan flags tracking whether self.data[t] is out of sync
+        # with transforms[t]; everything needs resampling initially
+        self._dirty = np.ones(self.nscans, dtype=bool)
 
     def resample(self, t):
         """
@@ -309,42 +514,127 @@ class Realign4dAlgorithm(object):
         X, Y, Z = scanner_coords(self.xyz, self.transforms[t].as_affine(),
                                  self.inv_affine, self.affine)
         if self.time_interp:
-            T = self.scanner_time(Z, self.timestamps[t])
-            _cspline_sample4d(self.data[:, t],
-                              self.cbspline,
-                              X, Y, Z, T,
-                              mx='reflect',
-                              my='reflect',
-                              mz='reflect',
-                              mt='reflect')
+            T = self.scaled_timestamps[t]\
+                    - self.scanner_time_correction(Z)
+            cspline_sample_tiled(self.data[t],
+                                 self.cbspline,
+                                 X, Y, Z, T,
+                                 mx='reflect',
+                                 my='reflect',
+                                 mz='reflect',
+                                 mt='reflect')
         else:
-            _cspline_sample3d(self.data[:, t],
-                              self.cbspline[:, :, :, t],
-                              X, Y, Z,
-                              mx='reflect',
-                              my='reflect',
-                              mz='reflect')
+            cspline_sample_tiled(self.data[t],
+                                 self.cbspline[:, :, :, t],
+                                 X, Y, Z,
+                                 mx='reflect',
+                                 my='reflect',
+                                 mz='reflect')
+        self._dirty[t] = False
+
+    def resample_all(self):
+        """
+        Resample every scan on the (sub-sampled) working grid
+        according to the current transforms.
+
+        With time interpolation, the coordinates of all scans are
+        stacked and fed to the 4d sampler as one batch, replacing
+        nscans Python-level dispatches with a single tiled call chain
+        writing into the contiguous data array. Without time
+        interpolation each scan has its own coefficient volume, so
+        scans are resampled one by one across threads.
+        """
+        if not self.time_interp:
+            map_parallel(self.resample, range(self.nscans))
+            return
+        Tv = scanner_transforms(self.transforms, self.inv_affine, self.affine)
+        XYZ = np.einsum('nj,tkj->tnk', self.xyz, Tv[:, 0:3, 0:3])
+        XYZ += Tv[:, np.newaxis, 0:3, 3]
+        Z = XYZ[:, :, 2]
+        T = self.scaled_timestamps[:, np.newaxis]\
+            - self.scanner_time_correction(Z)
+        cspline_sample_tiled(self.data.reshape(-1),
+                             self.cbspline,
+                             XYZ[:, :, 0].reshape(-1),
+                             XYZ[:, :, 1].reshape(-1),
+                             Z.reshape(-1),
+                             T.reshape(-1),
+                             mx='reflect',
+                             my='reflect',
+                             mz='reflect',
+                             mt='reflect')
+        self._dirty[:] = False
 
     def resample_full_data(self):
         if VERBOSE:
             print('Gridding...')
         xyz = make_grid(self.dims[0:3])
         res = np.zeros(self.dims)
-        for t in range(self.nscans):
+        # All transforms are fixed at this point, so the grid-to-grid
+        # affines can be computed in a single batched product.
+        Tv = scanner_transforms(self.transforms, self.inv_affine, self.affine)
+        if HAVE_CUPY:
+            return self._resample_full_data_cuda(xyz, Tv, res)
+
+        def _resample_one(t):
+            # Each scan writes to its own res[:, :, :, t] slab, so the
+            # tasks are independent and can safely run concurrently.
             if VERBOSE:
                 print('Fully resampling scan %d/%d' % (t + 1, self.nscans))
-            X, Y, Z = scanner_coords(xyz, self.transforms[t].as_affine(),
-                                     self.inv_affine, self.affine)
+            X, Y, Z = grid_coords(xyz, Tv[t])
+            # Sample into a flat contiguous buffer so that the tiled
+            # sampler writes sequentially, then reshape into the
+            # output slab.
+            out = np.zeros(xyz.shape[0], dtype=self.data.dtype)
             if self.time_interp:
-                T = self.scanner_time(Z, self.timestamps[t])
-                _cspline_sample4d(res[:, :, :, t],
-                                  self.cbspline,
-                                  X, Y, Z, T,
-                                  mt='nearest')
+                T = self.scaled_timestamps[t]\
+                    - self.scanner_time_correction(Z)
+                cspline_sample_tiled(out,
+                                     self.cbspline,
+                                     X, Y, Z, T,
+                                     mt='nearest')
             else:
-                _cspline_sample3d(res[:, :, :, t],
-                                  self.cbspline[:, :, :, t],
-                                  X, Y, Z)
+                cspline_sample_tiled(out,
+                                     self.cbspline[:, :, :, t],
+                                     X, Y, Z)
+            res[:, :, :, t] = out.reshape(self.dims[0:3])
+
+        map_parallel(_resample_one, range(self.nscans))
+        return res
+
+    def _resample_full_data_cuda(self, xyz, Tv, res):
+        """
+        GPU variant of `resample_full_data`, evaluating the cubic
+        spline coefficients with cupyx.scipy.ndimage.map_coordinates.
+
+        The boundary conventions of map_coordinates are not strictly
+        identical to those of the C sampler, so values may differ
+        slightly at the volume borders; time coordinates are clipped
+        to the acquisition interval to emulate the 'nearest' temporal
+        mode.
+        """
+        from cupyx.scipy import ndimage as cupy_ndimage
+        cbspline = cupy.asarray(self.cbspline)
+        for t in range(self.nscans):
+            if VERBOSE:
+                print('Fully resampling scan %d/%d on GPU'
+                      % (t + 1, self.nscans))
+            X, Y, Z = grid_coords(xyz, Tv[t])
+            if self.time_interp:
+                T = self.scaled_timestamps[t]\
+                    - self.scanner_time_correction(Z)
+                np.clip(T, 0, self.nscans - 1, out=T)
+                coords = cupy.asarray(np.array([X, Y, Z, T]))
+                out = cupy_ndimage.map_coordinates(cbspline, coords,
+                                                   order=3, mode='constant',
+                                                   prefilter=False)
+            else:
+                coords = cupy.asarray(np.array([X, Y, Z]))
+                out = cupy_ndimage.map_coordinates(cbspline[:, :, :, t],
+                                                   coords,
+                                                   order=3, mode='constant',
+                                                   prefilter=False)
+            res[:, :, :, t] = cupy.asnumpy(out).reshape(self.dims[0:3])
         return res
 
     def set_fmin(self, optimizer, stepsize, **kwargs):
@@ -379,14 +669,35 @@ class Realign4dAlgorithm(object):
 
         V/V0 = [nV* + (x-m*)^2] / [nV0* + (x-m0*)^2]
         """
-        fixed = list(range(self.nscans))
-        fixed.remove(t)
-        aux = self.data[:, fixed]
+        # Accumulate per-voxel sums and sums of squares over the fixed
+        # scans rather than materializing the (masksize, nscans - 1)
+        # fancy-indexed copy the direct computation would require. All
+        # intermediates live in preallocated scratch buffers; _aux is
+        # free here since it is only busy inside _init_energy.
+        n_fixed = self.nscans - 1
+        sum_fixed = self._sum
+        sumsq_fixed = self._sumsq
+        np.sum(self.data, 0, out=sum_fixed)
+        sum_fixed -= self.data[t]
+        np.einsum('ij,ij->j', self.data, self.data, out=sumsq_fixed)
+        np.multiply(self.data[t], self.data[t], out=self._aux)
+        sumsq_fixed -= self._aux
+        npts = n_fixed * sum_fixed.size
         if self.optimize_template:
-            self.mu = np.mean(aux, 1)
-        self.offset = self.nscans * np.mean((aux.T - self.mu) ** 2)
-        self.mu0 = np.mean(aux)
-        self.offset0 = self.nscans * np.mean((aux - self.mu0) ** 2)
+            self.mu = sum_fixed / n_fixed
+        # mean of (x - mu) ** 2 over the fixed scans, with mu
+        # broadcast along scans, built up in place as
+        # sumsq + mu * (n_fixed * mu - 2 * sum); clamp tiny negative
+        # values due to cancellation
+        np.multiply(self.mu, float(n_fixed), out=self._aux)
+        self._aux -= sum_fixed
+        self._aux -= sum_fixed
+        self._aux *= self.mu
+        self._aux += sumsq_fixed
+        self.offset = self.nscans * np.maximum(self._aux.mean(), 0) / n_fixed
+        self.mu0 = sum_fixed.sum() / npts
+        self.offset0 = self.nscans *\
+            np.maximum(sumsq_fixed.sum() / npts - self.mu0 ** 2, 0)
         self._t = t
         self._pc = None
 
@@ -395,29 +706,29 @@ class Realign4dAlgorithm(object):
         self.resample(t)
 
     def _init_energy(self, pc):
-        if pc is self._pc:
+        if self._pc is not None and np.array_equal(pc, self._pc):
             return
         self.set_transform(self._t, pc)
         self._pc = pc
-        self._res[:] = self.data[:, self._t] - self.mu[:]
-        self._V = np.maximum(self.offset + np.mean(self._res ** 2), SMALL)
-        self._res0[:] = self.data[:, self._t] - self.mu0
-        self._V0 = np.maximum(self.offset0 + np.mean(self._res0 ** 2), SMALL)
+        np.subtract(self.data[self._t], self.mu, self._res)
+        self._V = np.maximum(self.offset + mean_sq(self._res), SMALL)
+        np.subtract(self.data[self._t], self.mu0, self._res0)
+        self._V0 = np.maximum(self.offset0 + mean_sq(self._res0), SMALL)
 
         if self.use_derivatives:
             # linearize the data wrt the transform parameters
             # use the auxiliary array to save the current resampled data
-            self._aux[:] = self.data[:, self._t]
+            self._aux[:] = self.data[self._t]
             basis = np.eye(6)
             for j in range(pc.size):
                 self.set_transform(self._t, pc + self.stepsize * basis[j])
-                self.A[:, j] = (self.data[:, self._t] - self._aux)\
+                self.A[:, j] = (self.data[self._t] - self._aux)\
                     / self.stepsize
             self.transforms[self._t].param = pc
-            self.data[:, self._t] = self._aux[:]
+            self.data[self._t] = self._aux[:]
             # pre-compute gradient and hessian of numerator and
             # denominator
-            c = 2 / float(self.data.shape[0])
+            c = 2 / float(self.data.shape[1])
             self._dV = c * np.dot(self.A.T, self._res)
             self._dV0 = c * np.dot(self.A.T, self._res0)
             self._H = c * np.dot(self.A.T, self.A)
@@ -446,9 +757,18 @@ class Realign4dAlgorithm(object):
             print('Estimating motion at time frame %d/%d...'
                   % (t + 1, self.nscans))
 
+        energy_cache = {}
+
         def f(pc):
-            self._init_energy(pc)
-            return self._energy()
+            # An energy evaluation implies resampling the scan, and
+            # line searches (e.g. in Powell's method) happily revisit
+            # parameter points, so previously seen points are looked
+            # up rather than recomputed.
+            key = np.asarray(pc).tobytes()
+            if key not in energy_cache:
+                self._init_energy(pc)
+                energy_cache[key] = self._energy()
+            return energy_cache[key]
 
         def fprime(pc):
             self._init_energy(pc)
@@ -479,6 +799,9 @@ class Realign4dAlgorithm(object):
             self.set_transform(t, pc)
         except:
             warnings.warn('Minimization failed')
+            # data[t] may reflect the last parameter trial rather than
+            # the unchanged transform
+            self._dirty[t] = True
 
     def estimate_motion(self):
         """
@@ -487,15 +810,21 @@ class Realign4dAlgorithm(object):
         space/time transformation, the parameters of which are further
         optimized sequentially.
         """
-        for t in range(self.nscans):
-            if VERBOSE:
-                print('Resampling scan %d/%d' % (t + 1, self.nscans))
-            self.resample(t)
+        if VERBOSE:
+            print('Resampling %d scans...' % self.nscans)
+        # Skip scans whose data is already in sync with their
+        # transform: after the first loop, each scan was left
+        # consistent by its own optimization, so only scans whose
+        # minimization failed need resampling here.
+        if self._dirty.all():
+            self.resample_all()
+        else:
+            map_parallel(self.resample, np.flatnonzero(self._dirty))
 
         # Set the template as the reference scan (will be overwritten
         # if template is to be optimized)
         if not hasattr(self, 'template'):
-            self.mu = self.data[:, self.refscan].copy()
+            self.mu = self.data[self.refscan].copy()
         for t in range(self.nscans):
             self.estimate_instant_motion(t)
             if VERBOSE:
@@ -515,6 +844,7 @@ class Realign4dAlgorithm(object):
         Tref_inv = self.transforms[self.refscan].inv()
         for t in range(self.nscans):
             self.transforms[t] = (self.transforms[t]).compose(Tref_inv)
+        self._dirty[:] = True
 
 
 def resample4d(im4d, transforms, time_interp=True):
@@ -560,9 +890,11 @@ def single_run_realign4d(im4d,
     speedup : int or sequence
       If a sequence, implement a multi-scale realignment
     """
-    if not type(loops) in (list, tuple, np.array):
-        loops = [loops]
-    repeats = len(loops)
+    # The number of passes is set by the longest sequence argument;
+    # scalar arguments are repeated for each pass.
+    repeats = max(len(x) if type(x) in (list, tuple) else 1
+                  for x in (loops, speedup, optimizer, xtol, ftol, gtol,
+                            stepsize, maxiter, maxfun))
 
     def format_arg(x):
         if not type(x) in (list, tuple, np.array):
@@ -572,6 +904,7 @@ def single_run_realign4d(im4d,
                 raise ValueError('inconsistent length in arguments')
         return x
 
+    loops = format_arg(loops)
     speedup = format_arg(speedup)
     optimizer = format_arg(optimizer)
     xtol = format_arg(xtol)
@@ -693,8 +1026,10 @@ def realign4d(runs,
                                 for t in transforms[i]]
         corr_run = resample4d(runs[i], transforms=transforms_i,
                               time_interp=time_interp)
-        mean_img_data[..., i] = corr_run.mean(3)
-    del corr_run
+        # reduce directly into the mean image stack and release the
+        # resampled run before the next one is allocated
+        np.mean(corr_run, axis=3, out=mean_img_data[..., i])
+        del corr_run
 
     mean_img = Image4d(mean_img_data, affine=runs[0].affine,
                        tr=1.0, slice_times=0)
@@ -791,10 +1126,10 @@ class Realign4d(object):
         self._time_interp = time_interp
 
     def estimate(self,
-                 loops=5,
+                 loops=(5, 1),
                  between_loops=None,
                  align_runs=True,
-                 speedup=5,
+                 speedup=(5, 2),
                  refscan=0,
                  borders=(1, 1, 1),
                  optimizer='ncg',
@@ -822,9 +1157,12 @@ class Realign4d(object):
             realign scans across runs, a procedure similar to
             within-run realignment that uses the mean images from each
             run. If None, assumed to be the same as ``loops``.
-            The setting used in the experiments described in Roche,
-            IEEE TMI 2011, was: ``speedup`` = (5, 2), ``loops`` = (5,
-            1) and ``between_loops`` = (5, 1).
+            The defaults implement the coarse-to-fine schedule used in
+            the experiments described in Roche, IEEE TMI 2011:
+            ``speedup`` = (5, 2), ``loops`` = (5, 1) and
+            ``between_loops`` = (5, 1), i.e. motion is first estimated
+            on a heavily subsampled grid and then refined on a finer
+            one.
         align_runs : bool
             Determines whether between-run motion is estimated or
             not. If False, the ``between_loops`` argument is ignored.
@@ -1184,8 +1522,7 @@ class FmriRealign4d(Realign4d):
                                       'deprecated',
                                       FutureWarning,
                                       stacklevel=2)
-                        aux = np.argsort(list(range(0, nslices, 2)) +
-                                         list(range(1, nslices, 2)))
+                        aux = interleaved_slice_order(nslices)
                     else:
                         aux = np.arange(nslices)
                     if slice_order == 'descending':
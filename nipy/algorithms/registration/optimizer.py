@@ -1,12 +1,31 @@
 from __future__ import absolute_import
 from scipy.optimize import (fmin as fmin_simplex,
-                            fmin_powell,
+                            minimize,
                             fmin_cg,
                             fmin_bfgs,
                             fmin_ncg)
 from ..optimize import fmin_steepest
 
 
+def fmin_powell(f, x0, xtol=1e-4, ftol=1e-4, maxiter=None, maxfun=None,
+                bounds=None, disp=False, callback=None):
+    """
+    Powell minimization routed through `scipy.optimize.minimize`.
+
+    Unlike the legacy `scipy.optimize.fmin_powell` this exposes box
+    `bounds` on the parameters, while keeping the legacy calling
+    convention expected by `configure_optimizer` users.
+    """
+    options = {'xtol': xtol, 'ftol': ftol, 'disp': disp}
+    if maxiter is not None:
+        options['maxiter'] = maxiter
+    if maxfun is not None:
+        options['maxfev'] = maxfun
+    res = minimize(f, x0, method='Powell', bounds=bounds,
+                   callback=callback, options=options)
+    return res.x
+
+
 def subdict(dic, keys):
     sdic = {}
     for k in keys:
@@ -22,12 +41,13 @@ def configure_optimizer(optimizer, fprime=None, fhess=None, **kwargs):
     kwargs['fprime'] = fprime
     kwargs['fhess'] = fhess
     kwargs['avextol'] = kwargs['xtol']
+    kwargs.setdefault('bounds', None)
 
     if optimizer == 'simplex':
         keys = ('xtol', 'ftol', 'maxiter', 'maxfun')
         fmin = fmin_simplex
     elif optimizer == 'powell':
-        keys = ('xtol', 'ftol', 'maxiter', 'maxfun')
+        keys = ('xtol', 'ftol', 'maxiter', 'maxfun', 'bounds')
         fmin = fmin_powell
     elif optimizer == 'cg':
         keys = ('gtol', 'maxiter', 'fprime')
@@ -6,7 +6,10 @@ import numpy as np
 
 from .._registration import (_cspline_transform,
                              _cspline_sample1d,
-                             _cspline_sample4d)
+                             _cspline_sample3d,
+                             _cspline_sample4d,
+                             _cspline_sample3d_f32,
+                             _cspline_sample4d_f32)
 
 from numpy.testing import assert_array_almost_equal
 
@@ -35,3 +38,27 @@ def test_sample4d():
     args = list(x) + ['nearest' for i in range(4)]
     b = _cspline_sample4d(b, c, *args)
     assert_array_almost_equal(a, b)
+
+
+def test_sample3d_f32():
+    a = np.random.rand(6, 7, 8)
+    c = _cspline_transform(a)
+    x = [u + .3 for u in np.mgrid[0:6, 0:7, 0:8]]
+    b = np.zeros(a.shape)
+    b = _cspline_sample3d(b, c, *x)
+    b32 = np.zeros(a.shape, dtype='float32')
+    b32 = _cspline_sample3d_f32(b32, c.astype('float32'), *x)
+    assert_equal(b32.dtype, np.dtype('float32'))
+    assert_array_almost_equal(b, b32, decimal=5)
+
+
+def test_sample4d_f32():
+    a = np.random.rand(4, 5, 6, 7)
+    c = _cspline_transform(a)
+    x = [u + .3 for u in np.mgrid[0:4, 0:5, 0:6, 0:7]]
+    b = np.zeros(a.shape)
+    b = _cspline_sample4d(b, c, *x)
+    b32 = np.zeros(a.shape, dtype='float32')
+    b32 = _cspline_sample4d_f32(b32, c.astype('float32'), *x)
+    assert_equal(b32.dtype, np.dtype('float32'))
+    assert_array_almost_equal(b, b32, decimal=4)
@@ -8,7 +8,8 @@ import numpy as np
 import nibabel as nib
 
 from nose.tools import assert_equal
-from numpy.testing import (assert_array_almost_equal,
+from numpy.testing import (assert_allclose,
+                           assert_array_almost_equal,
                            assert_array_equal,
                            assert_raises)
 
@@ -21,7 +22,8 @@ from ...slicetiming.timefuncs import st_43210, st_02413, st_42031
 from ..affine import Rigid
 from ..groupwise_registration import (Image4d, resample4d, FmriRealign4d,
                                       SpaceTimeRealign, SpaceRealign, Realign4d,
-                                      Realign4dAlgorithm, make_grid)
+                                      Realign4dAlgorithm, make_grid,
+                                      interleaved_slice_order)
 
 IM = load_image(funcfile)
 IMS = [nib.Nifti1Image(np.zeros((2, 3, 4, 5)), np.eye(4)) for i in range(4)]
@@ -84,6 +86,16 @@ def test_realign4d_ascending_interleaved():
     assert R.tr == 3
 
 
+def test_interleaved_slice_order():
+    # The closed form should match the inverse permutation of the
+    # acquisition order [0, 2, 4, ..., 1, 3, 5, ...] for both odd and
+    # even numbers of slices
+    for nslices in range(1, 31):
+        acq_order = list(range(0, nslices, 2)) + list(range(1, nslices, 2))
+        assert_array_equal(interleaved_slice_order(nslices),
+                           np.argsort(acq_order))
+
+
 def test_realign4d_descending_interleaved():
     runs = [IM, IM]
     R = FmriRealign4d(runs, tr=3, slice_order='descending', interleaved=True)
@@ -238,6 +250,43 @@ def test_lowlevel_params():
     assert_raises(ValueError, Realign4dAlgorithm, R._runs[0], maxfun='none')
 
 
+def test_lowlevel_dtype():
+    runs = [IM, IM]
+    R = SpaceTimeRealign(runs, tr=21, slice_times='ascending', slice_info=1)
+    r64 = Realign4dAlgorithm(R._runs[0])
+    r64.resample_all()
+    # Single precision resampling should stay close to the double
+    # precision reference
+    r32 = Realign4dAlgorithm(R._runs[0], dtype='float32')
+    assert_equal(r32.data.dtype, np.dtype('float32'))
+    assert_equal(r32.cbspline.dtype, np.dtype('float32'))
+    r32.resample_all()
+    assert_allclose(r64.data, r32.data, rtol=1e-4)
+    # Only the two float dtypes are valid storage precisions
+    assert_raises(ValueError, Realign4dAlgorithm, R._runs[0], dtype='int16')
+
+
+def test_init_instant_motion_statistics():
+    # The one-pass sum / sum-of-squares computation should match the
+    # direct formulas on the fancy-indexed block of fixed scans
+    im4d = Image4d(np.random.rand(8, 9, 4, 5), np.eye(4), tr=2.,
+                   slice_times=0.0)
+    r = Realign4dAlgorithm(im4d)
+    r.data[:] = np.random.rand(*r.data.shape)
+    for t in (0, 2, r.nscans - 1):
+        r.init_instant_motion(t)
+        fixed = [s for s in range(r.nscans) if not s == t]
+        aux = r.data[fixed]
+        mu = np.mean(aux, 0)
+        assert_array_almost_equal(r.mu, mu)
+        assert_array_almost_equal(r.offset,
+                                  r.nscans * np.mean((aux - mu) ** 2))
+        mu0 = np.mean(aux)
+        assert_array_almost_equal(r.mu0, mu0)
+        assert_array_almost_equal(r.offset0,
+                                  r.nscans * np.mean((aux - mu0) ** 2))
+
+
 def _test_make_grid(dims, subsampling, borders, expected_nvoxels):
     x = make_grid(dims, subsampling, borders)
     assert_equal(x.shape[0], expected_nvoxels)
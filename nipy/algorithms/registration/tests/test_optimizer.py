@@ -0,0 +1,52 @@
+""" Testing the optimizer configuration helpers
+"""
+from __future__ import absolute_import
+
+import numpy as np
+
+from nose.tools import assert_equal, assert_true
+from numpy.testing import assert_array_almost_equal
+
+from ..optimizer import configure_optimizer, use_derivatives
+
+XOPT = np.array([1., -2.])
+
+
+def _quadratic(x):
+    return np.sum((np.asarray(x) - XOPT) ** 2)
+
+
+def _configure(optimizer, **kwargs):
+    kwargs.setdefault('xtol', 1e-6)
+    kwargs.setdefault('ftol', 1e-6)
+    kwargs.setdefault('gtol', 1e-5)
+    kwargs.setdefault('maxiter', 100)
+    kwargs.setdefault('maxfun', None)
+    return configure_optimizer(optimizer, **kwargs)
+
+
+def test_configure_powell():
+    fmin, args, kwargs = _configure('powell')
+    assert_equal(fmin.__name__, 'fmin_powell')
+    assert_equal(kwargs['bounds'], None)
+    assert_true(not use_derivatives('powell'))
+    calls = []
+    x = fmin(_quadratic, np.zeros(2), *args,
+             disp=False, callback=calls.append, **kwargs)
+    assert_array_almost_equal(x, XOPT, decimal=4)
+    assert_true(len(calls) > 0)
+
+
+def test_configure_powell_maxfun():
+    # The legacy maxfun argument maps onto the maxfev option
+    fmin, args, kwargs = _configure('powell', maxfun=3000)
+    x = fmin(_quadratic, np.zeros(2), *args, disp=False, **kwargs)
+    assert_array_almost_equal(x, XOPT, decimal=4)
+
+
+def test_configure_powell_bounds():
+    # Box constraints excluding the unconstrained minimum: the second
+    # parameter should land on its lower bound
+    fmin, args, kwargs = _configure('powell', bounds=[(0., 2.), (-1., 3.)])
+    x = fmin(_quadratic, np.zeros(2), *args, disp=False, **kwargs)
+    assert_array_almost_equal(x, [1., -1.], decimal=4)